@@ -10,9 +10,10 @@ XDR Brightness (menu-bar) App
 
 import os
 import sys
+import plistlib
 import subprocess
 from pathlib import Path
-import rumps
+from typing import Optional
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -22,46 +23,223 @@ DDCCTL_PATH      = "/usr/local/bin/ddcctl"   # Home-brew default
 BRIGHTNESS_XDR   = "100"                     # 0–100  (approx. 1600 nits)
 BRIGHTNESS_NORMAL = "50"                     # back to comfort mode
 
+# LaunchAgent plist – resolved once at import time
+_HOME   = Path.home()
+_PYTHON = "/usr/bin/python3"   # stable shim, survives Xcode / CLT moves
+_SCRIPT = os.path.abspath(__file__)
+_LAUNCHD_LABEL = "com.xdr.brightness"
+_PLIST_PATH    = _HOME / f"Library/LaunchAgents/{_LAUNCHD_LABEL}.plist"
 
-class XDRBrightnessApp(rumps.App):
-    def __init__(self) -> None:
-        super().__init__("☀️", quit_button=None)
-
-        # Menu items -----------------------------------------------------------
-        self.enable_item   = rumps.MenuItem("⚡ Enable XDR Brightness",
-                                            callback=self.toggle_xdr)
-        self.startup_item  = rumps.MenuItem("🚀 Launch at Startup",
-                                            callback=self.toggle_startup)
-        self.quit_item     = rumps.MenuItem("Quit", callback=self.quit_app)
-
-        # Build the menu
-        self.menu = [self.enable_item, self.startup_item, None, self.quit_item]
-
-        # Runtime state
-        self.enabled = False
-        self.update_menu_state()
-
-    # ─────────────────────────────────────────────
-    # Helpers
-    # ─────────────────────────────────────────────
-    def _run_ddcctl(self, enable: bool) -> None:
-        """Call ddcctl via AppleScript so macOS will show a password prompt,
-           and handle 'usage' failures gracefully."""
-        brightness = BRIGHTNESS_XDR if enable else BRIGHTNESS_NORMAL
-        script = (
-            f'do shell script "{DDCCTL_PATH} -d 1 -b {brightness}" '
-            "with administrator privileges"
-        )
-
-        try:
-            subprocess.run(
-                ["osascript", "-e", script],
-                check=True,
+
+def _launch_agent_plist(python: str, script: str) -> bytes:
+    # plistlib takes care of XML escaping (paths may contain & or <)
+    return plistlib.dumps({
+        "Label": _LAUNCHD_LABEL,
+        "ProgramArguments": [python, script],
+        "RunAtLoad": True,
+        "ProcessType": "Interactive",
+        "LimitLoadToSessionType": "Aqua",
+    }, sort_keys=False)
+
+
+_PLIST_BYTES = _launch_agent_plist(_PYTHON, _SCRIPT)
+
+SUDO_PATH      = "/usr/bin/sudo"
+
+# Shell loop behind the ddcctl helper. It runs as the user and only elevates
+# ddcctl itself, so a single sudoers line is enough to skip the password:
+#     <user> ALL=(root) NOPASSWD: /usr/local/bin/ddcctl
+# Says "ready" once, then answers each "-b <level>" line with
+# "<exit status> <stderr, newlines as tabs>".
+_DDCCTL_HELPER_SCRIPT = f"""echo ready
+while read -r cmd; do
+    err=$("{SUDO_PATH}" -n "{DDCCTL_PATH}" -d 1 $cmd 2>&1 >/dev/null)
+    rc=$?
+    printf '%s %s\\n' "$rc" "$(printf '%s' "$err" | tr '\\n' '\\t')"
+done"""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# LaunchAgent management – no rumps / AppKit needed
+# ──────────────────────────────────────────────────────────────────────────────
+def install_launch_agent(plist_path: Path = _PLIST_PATH,
+                         script: str = _SCRIPT,
+                         python: str = _PYTHON) -> None:
+    """Write the LaunchAgent plist for *script* run by *python*.
+
+    The agent is not bootstrapped right away – that would start a second copy
+    of an already running app. launchd picks it up at next login."""
+    if script == _SCRIPT and python == _PYTHON:
+        plist = _PLIST_BYTES
+    else:
+        plist = _launch_agent_plist(python, script)
+
+    # Stage + rename so a crash never leaves a half-written plist behind
+    tmp = plist_path.with_suffix(".plist.tmp")
+    tmp.write_bytes(plist)
+    os.replace(tmp, plist_path)
+
+
+def remove_launch_agent(plist_path: Path = _PLIST_PATH) -> None:
+    """Delete the LaunchAgent plist, if present.
+
+    That alone stops the launch at next login. The agent is deliberately not
+    booted out: it is only loaded when launchd started this very app, and
+    bootout would quit the app the user is clicking in."""
+    if plist_path.exists():
+        plist_path.unlink()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Menu-bar app – built on demand so CLI paths never import rumps / PyObjC
+# ──────────────────────────────────────────────────────────────────────────────
+def _make_app_class() -> type:
+    import rumps
+
+    class XDRBrightnessApp(rumps.App):
+        def __init__(self) -> None:
+            super().__init__("☀️", quit_button=None)
+
+            # Menu items -----------------------------------------------------------
+            self.enable_item   = rumps.MenuItem("⚡ Enable XDR Brightness",
+                                                callback=self.toggle_xdr)
+            self.startup_item  = rumps.MenuItem("🚀 Launch at Startup",
+                                                callback=self.toggle_startup)
+            self.quit_item     = rumps.MenuItem("Quit", callback=self.quit_app)
+
+            # Build the menu
+            self.menu = [self.enable_item, self.startup_item, None, self.quit_item]
+
+            # Runtime state
+            self.enabled = False
+
+            # LaunchAgent state rarely changes, so probe it once and only
+            # update it when we install / remove the agent ourselves.
+            self._startup_installed: Optional[bool] = None
+
+            # Long-lived shell feeding `sudo -n ddcctl` (started on first toggle)
+            self._helper: Optional[subprocess.Popen] = None
+            self._helper_unavailable = False
+
+            self.update_menu_state()
+
+        # ─────────────────────────────────────────────
+        # Helpers
+        # ─────────────────────────────────────────────
+        def _ddcctl_helper(self) -> Optional[subprocess.Popen]:
+            """Return a persistent shell that runs `sudo -n ddcctl` per stdin line.
+
+            Only possible when sudo allows ddcctl without a prompt; otherwise
+            returns None and the caller falls back to the AppleScript path. The
+            shell answers every command with one "<exit status> <stderr>" line
+            so failures can still be reported."""
+            if self._helper is not None:
+                if self._helper.poll() is None:
+                    return self._helper
+                # Exited between toggles – same rule as dying mid-command
+                self._helper_unavailable = True
+                self._stop_ddcctl_helper()
+            if self._helper_unavailable:
+                return None
+
+            probe = subprocess.run(
+                [SUDO_PATH, "-n", "-l", DDCCTL_PATH],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False
+            )
+            if probe.returncode != 0:
+                self._helper_unavailable = True
+                return None
+
+            self._helper = subprocess.Popen(
+                ["/bin/sh", "-c", _DDCCTL_HELPER_SCRIPT],
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
             )
-        except subprocess.CalledProcessError as exc:
-            err = exc.stderr.decode(errors="ignore").strip()
+            if self._helper.stdout.readline().strip() != "ready":
+                # Exited before the loop was up – don't try again this session
+                self._helper_unavailable = True
+                self._stop_ddcctl_helper()
+                return None
+            return self._helper
+
+        def _stop_ddcctl_helper(self) -> None:
+            if self._helper is None:
+                return
+            try:
+                self._helper.stdin.close()
+                self._helper.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self._helper.kill()
+                self._helper.wait()
+            self._helper.stdout.close()
+            self._helper = None
+
+        def _ddcctl_via_helper(self, brightness: str) -> Optional[str]:
+            """Run ddcctl through the helper.
+
+            Returns None on success, ddcctl's stderr on failure, and raises
+            OSError if the helper is gone before it answered."""
+            helper = self._helper
+            helper.stdin.write(f"-b {brightness}\n")
+            helper.stdin.flush()
+
+            reply = helper.stdout.readline()
+            if not reply:
+                raise OSError("ddcctl helper exited")
+            status, _, err = reply.rstrip("\n").partition(" ")
+            if status == "0":
+                return None
+            return err.replace("\t", "\n").strip()
+
+        def _ddcctl_via_osascript(self, brightness: str) -> Optional[str]:
+            """Run ddcctl via AppleScript so macOS will show a password prompt.
+
+            Returns None on success and ddcctl's stderr on failure."""
+            script = (
+                f'do shell script "{DDCCTL_PATH} -d 1 -b {brightness}" '
+                "with administrator privileges"
+            )
+
+            try:
+                subprocess.run(
+                    ["osascript", "-e", script],
+                    check=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
+            except subprocess.CalledProcessError as exc:
+                return exc.stderr.decode(errors="ignore").strip()
+            return None
+
+        def _run_ddcctl(self, enable: bool) -> None:
+            """Send the brightness to the persistent ddcctl helper if we have one,
+               otherwise go through AppleScript, and handle 'usage' failures
+               gracefully on both paths."""
+            brightness = BRIGHTNESS_XDR if enable else BRIGHTNESS_NORMAL
+
+            err = None
+            sent = False
+            if self._ddcctl_helper() is not None:
+                try:
+                    err = self._ddcctl_via_helper(brightness)
+                    sent = True
+                except OSError:
+                    # The helper shell itself went away (killed, or exited on its
+                    # own) – don't restart it, use the prompting path from now on
+                    self._helper_unavailable = True
+                    self._stop_ddcctl_helper()
+
+            if not sent:
+                err = self._ddcctl_via_osascript(brightness)
+
+            if err is None:
+                return
 
             # ddcctl prints its usage whenever no DDC/CI display is found
             if "Usage:" in err:
@@ -75,72 +253,60 @@ class XDRBrightnessApp(rumps.App):
 
             rumps.alert(f"Brightness change failed:\n{user_msg}")
 
+        def _plist_path(self) -> Path:
+            return _PLIST_PATH
+
+        @property
+        def _launch_agent_installed(self) -> bool:
+            if self._startup_installed is None:
+                self._startup_installed = self._plist_path().exists()
+            return self._startup_installed
+
+        # ─────────────────────────────────────────────
+        # Menu callbacks
+        # ─────────────────────────────────────────────
+        def toggle_xdr(self, _sender) -> None:
+            self.enabled = not self.enabled
+            self._run_ddcctl(self.enabled)
+            self.update_menu_state()
+
+        def toggle_startup(self, _sender) -> None:
+            if self._launch_agent_installed:
+                self._remove_launch_agent()
+            else:
+                self._install_launch_agent()
+            self.update_menu_state()
+
+        def quit_app(self, _sender) -> None:
+            self._stop_ddcctl_helper()
+            rumps.quit_application()
+
+        # ─────────────────────────────────────────────
+        # LaunchAgent management
+        # ─────────────────────────────────────────────
+        def _install_launch_agent(self) -> None:
+            install_launch_agent(self._plist_path())
+            self._startup_installed = True
+
+        def _remove_launch_agent(self) -> None:
+            remove_launch_agent(self._plist_path())
+            self._startup_installed = False
 
+        # ─────────────────────────────────────────────
+        # UI refresh
+        # ─────────────────────────────────────────────
+        def update_menu_state(self) -> None:
+            """Refresh checkmarks to reflect current state."""
+            self.enable_item.state  = self.enabled
+            self.startup_item.state = self._launch_agent_installed
 
-    def _plist_path(self) -> Path:
-        return Path.home() / "Library/LaunchAgents/com.xdr.brightness.plist"
-
-    def _launch_agent_installed(self) -> bool:
-        return self._plist_path().exists()
-
-    # ─────────────────────────────────────────────
-    # Menu callbacks
-    # ─────────────────────────────────────────────
-    def toggle_xdr(self, _sender) -> None:
-        self.enabled = not self.enabled
-        self._run_ddcctl(self.enabled)
-        self.update_menu_state()
-
-    def toggle_startup(self, _sender) -> None:
-        if self._launch_agent_installed():
-            self._remove_launch_agent()
-        else:
-            self._install_launch_agent()
-        self.update_menu_state()
-
-    def quit_app(self, _sender) -> None:
-        rumps.quit_application()
-
-    # ─────────────────────────────────────────────
-    # LaunchAgent management
-    # ─────────────────────────────────────────────
-    def _install_launch_agent(self) -> None:
-        plist = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>Label</key><string>com.xdr.brightness</string>
-    <key>ProgramArguments</key>
-    <array>
-        <string>/usr/bin/python3</string>
-        <string>{Path(__file__).as_posix()}</string>
-    </array>
-    <key>RunAtLoad</key><true/>
-</dict>
-</plist>"""
-        path = self._plist_path()
-        path.write_text(plist)
-        subprocess.run(["launchctl", "load", str(path)], check=False)
-
-    def _remove_launch_agent(self) -> None:
-        path = self._plist_path()
-        if path.exists():
-            subprocess.run(["launchctl", "unload", str(path)], check=False)
-            path.unlink()
-
-    # ─────────────────────────────────────────────
-    # UI refresh
-    # ─────────────────────────────────────────────
-    def update_menu_state(self) -> None:
-        """Refresh checkmarks to reflect current state."""
-        self.enable_item.state  = self.enabled
-        self.startup_item.state = self._launch_agent_installed()
+    return XDRBrightnessApp
 
 # ──────────────────────────────────────────────────────────────────────────────
 # CLI helper – called by installer script
 # ──────────────────────────────────────────────────────────────────────────────
 def cli_install_launch_agent():
-    XDRBrightnessApp()._install_launch_agent()
+    install_launch_agent(_PLIST_PATH, _SCRIPT, _PYTHON)
     print("LaunchAgent installed. It will run at next login.")
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -149,5 +315,5 @@ if __name__ == "__main__":
         cli_install_launch_agent()
         sys.exit(0)
 
-    app = XDRBrightnessApp()
+    app = _make_app_class()()
     app.run()
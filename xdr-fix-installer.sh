@@ -16,9 +16,12 @@ echo
 # ─────────────────────────────────────────────────────────
 #  Dependencies
 # ─────────────────────────────────────────────────────────
-read -p "Install Python ‘rumps’ library (required)? [y/N] " ans
-if [[ "$ans" =~ ^[Yy]$ ]]; then
-    pip3 install --user rumps
+# find_spec only looks on disk – no need to actually import rumps / PyObjC
+if ! /usr/bin/python3 -c 'import importlib.util, sys; sys.exit(importlib.util.find_spec("rumps") is None)' 2>/dev/null; then
+    read -p "Install Python ‘rumps’ library (required)? [y/N] " ans
+    if [[ "$ans" =~ ^[Yy]$ ]]; then
+        /usr/bin/python3 -m pip install --user rumps
+    fi
 fi
 
 if ! command -v ddcctl >/dev/null 2>&1; then
@@ -48,6 +51,11 @@ chmod +x "$LAUNCH_CMD"
 echo "✅ Installation finished!  App located in:"
 echo "   $APP_DIR"
 echo
+echo "💡 Tip: to toggle without a password prompt every time, run"
+echo "   sudo visudo -f /etc/sudoers.d/xdr-brightness"
+echo "   and add this line:"
+echo "   $(whoami) ALL=(root) NOPASSWD: $(command -v ddcctl || echo /usr/local/bin/ddcctl)"
+echo
 
 # ─────────────────────────────────────────────────────────
 #  Optional auto-launch